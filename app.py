@@ -1,14 +1,21 @@
 import os
+import csv
+import functools
+import io
+import itertools
+import threading
+import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 import sqlite3
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, Tuple
 
-from flask import Flask, render_template, request, redirect, url_for, send_file, Response
+from flask import Flask, render_template, request, redirect, url_for, send_file, Response, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy.exc import IntegrityError
-from sqlalchemy import func
-import pandas as pd
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy import case, event, func, select, text, true, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+import numpy as np
 from dotenv import load_dotenv
 
 
@@ -16,6 +23,32 @@ BASE_DIR = Path(__file__).resolve().parent
 DEFAULT_DB_PATH = BASE_DIR / "words.db"
 DICTIONARY_DB_PATH = BASE_DIR / "stardict.db"
 
+# Default cap on bound parameters per statement: 32766 since SQLite 3.32, 999 before
+SQLITE_MAX_VARIABLES = 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+# Values per single-column IN (...) list
+SQLITE_BATCH_SIZE = 500
+# The active study plan is effectively a singleton; re-read it at most once per TTL
+PLAN_CACHE_TTL = 60
+_PLAN_CACHE: Dict[str, Any] = {"plan": None, "ts": 0.0}
+# Dictionary lookups reuse one read-only connection per thread
+_DICT_CONN = threading.local()
+# CSV rows upserted per batch during import
+IMPORT_CHUNK_SIZE = 10000
+IMPORT_COLUMNS = ["word", "meaning", "example_sentence", "part_of_speech", "difficulty_level"]
+EXPORT_CSV_COLUMNS = IMPORT_COLUMNS + [
+    "date_added",
+    "times_studied",
+    "times_correct",
+    "last_studied",
+    "next_review",
+    "ease_factor",
+    "interval",
+    "repetitions",
+]
+WORDS_PAGE_SIZE = 100
+# Rows fetched per round-trip when streaming exports
+EXPORT_BATCH_SIZE = 1000
+
 
 load_dotenv()
 
@@ -33,9 +66,23 @@ app.config["FSRS_WEIGHTS"] = {
 
 db = SQLAlchemy(app)
 
+# Applied to every new SQLite connection in the pool
+SQLITE_PRAGMAS = [
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA cache_size = -65536",
+    "PRAGMA foreign_keys = ON",
+]
+
 
 class Word(db.Model):
     __tablename__ = "word"
+    __table_args__ = (
+        db.Index("ix_word_due", "next_review", "repetitions", "date_added"),
+        db.Index("ix_word_new", "date_added", sqlite_where=text("repetitions = 0")),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     word = db.Column(db.String(100), unique=True, nullable=False)
@@ -51,6 +98,9 @@ class Word(db.Model):
     ease_factor = db.Column(db.Float, default=2.5)
     interval = db.Column(db.Integer, default=0)
     repetitions = db.Column(db.Integer, default=0)
+    # Never lazy-load: per-row access in a list view would be an N+1; query
+    # StudySession explicitly. delete_word removes sessions before the word.
+    study_sessions = db.relationship("StudySession", lazy="raise", passive_deletes="all")
 
 
 class StudyPlan(db.Model):
@@ -64,9 +114,13 @@ class StudyPlan(db.Model):
 
 class StudySession(db.Model):
     __tablename__ = "study_session"
+    __table_args__ = (
+        db.Index("ix_studysession_review_date", "review_date"),
+        db.Index("ix_studysession_word_id", "word_id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    word_id = db.Column(db.Integer, nullable=False)
+    word_id = db.Column(db.Integer, db.ForeignKey("word.id"), nullable=False)
     quality = db.Column(db.Integer, nullable=False)
     review_date = db.Column(db.DateTime, default=datetime.utcnow)
     next_review = db.Column(db.DateTime)
@@ -75,16 +129,26 @@ class StudySession(db.Model):
 
 
 def get_active_study_plan(db_session) -> StudyPlan:
+    """Return the active plan as a detached object, cached for PLAN_CACHE_TTL seconds."""
+    cached = _PLAN_CACHE["plan"]
+    if cached is not None and time.time() - _PLAN_CACHE["ts"] < PLAN_CACHE_TTL:
+        return cached
+
     plan = db_session.query(StudyPlan).filter_by(is_active=True).order_by(StudyPlan.id.desc()).first()
     if plan is None:
         plan = StudyPlan(words_per_day=20, is_active=True)
         db_session.add(plan)
         db_session.commit()
+        db_session.refresh(plan)
+    # Detach so the cached copy is never expired by another request's commit
+    db_session.expunge(plan)
+    _PLAN_CACHE["plan"] = plan
+    _PLAN_CACHE["ts"] = time.time()
     return plan
 
 
-def current_time() -> datetime:
-    return datetime.now(timezone.utc)
+# Stored timestamps are naive UTC, so DB-bound "now" values skip the tz round-trip
+_utcnow = datetime.utcnow
 
 
 def to_naive_utc(dt: Optional[datetime]) -> Optional[datetime]:
@@ -95,42 +159,104 @@ def to_naive_utc(dt: Optional[datetime]) -> Optional[datetime]:
     return dt
 
 
+# SQLite's NOCASE collation folds only ASCII letters; fold keys the same way
+_NOCASE_FOLD = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+def nocase_key(word: str) -> str:
+    return word.translate(_NOCASE_FOLD)
+
+
+def _dictionary_entry_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+    return {
+        "word": row["word"],
+        "phonetic": row["phonetic"],
+        "definition": row["definition"],
+        "pos": row["pos"],
+        "detail": row["detail"],
+    }
+
+
+def get_dictionary_connection() -> sqlite3.Connection:
+    conn = getattr(_DICT_CONN, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(str(DICTIONARY_DB_PATH))
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA query_only = 1")
+        conn.execute("PRAGMA mmap_size = 268435456")
+        _DICT_CONN.conn = conn
+    return conn
+
+
+@functools.lru_cache(maxsize=65536)
+def _lookup_dictionary_entry_cached(query_word: str) -> Optional[Dict[str, Any]]:
+    row = get_dictionary_connection().execute(
+        "SELECT word, phonetic, definition, pos, detail FROM stardict WHERE word = ? COLLATE NOCASE LIMIT 1",
+        (query_word,),
+    ).fetchone()
+    if not row:
+        return None
+    return _dictionary_entry_from_row(row)
+
+
 def lookup_dictionary_entry(query_word: str) -> Optional[Dict[str, Any]]:
     if not DICTIONARY_DB_PATH.exists():
         return None
     try:
-        conn = sqlite3.connect(str(DICTIONARY_DB_PATH))
-        conn.row_factory = sqlite3.Row
-        cur = conn.cursor()
-        cur.execute(
-            "SELECT word, phonetic, definition, pos, detail FROM stardict WHERE word = ? COLLATE NOCASE LIMIT 1",
-            (query_word,),
-        )
-        row = cur.fetchone()
-        conn.close()
-        if not row:
-            return None
-        return {
-            "word": row["word"],
-            "phonetic": row["phonetic"],
-            "definition": row["definition"],
-            "pos": row["pos"],
-            "detail": row["detail"],
-        }
+        return _lookup_dictionary_entry_cached(nocase_key(query_word))
     except Exception:
         return None
 
 
+def lookup_dictionary_entries(query_words: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """Look up many words in one pass over the dictionary, keyed by nocase_key(word)."""
+    if not DICTIONARY_DB_PATH.exists():
+        return {}
+    words = list({nocase_key(w) for w in query_words if w})
+    entries: Dict[str, Dict[str, Any]] = {}
+    try:
+        cur = get_dictionary_connection().cursor()
+        for start in range(0, len(words), SQLITE_BATCH_SIZE):
+            chunk = words[start:start + SQLITE_BATCH_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            cur.execute(
+                "SELECT word, phonetic, definition, pos, detail FROM stardict "
+                f"WHERE word COLLATE NOCASE IN ({placeholders})",
+                chunk,
+            )
+            for row in cur.fetchall():
+                # Keep the first row per key, as the LIMIT 1 single-word lookup does
+                key = nocase_key(row["word"])
+                if key not in entries:
+                    entries[key] = _dictionary_entry_from_row(row)
+    except Exception:
+        return entries
+    return entries
+
+
+# Scheduler steps that depend only on the rating: ease change per quality 0-5
+# and the fixed intervals for the first two successful repetitions
+EASE_DELTA = [0.1 - (5 - q) * (0.08 + (5 - q) * 0.02) for q in range(6)]
+EASE_DELTA_ARRAY = np.array(EASE_DELTA)
+INITIAL_INTERVAL = {0: 1, 1: 6}
+
+
+def clamp_quality(quality: int) -> int:
+    """Clamp a rating to the 0-5 scale; applied where ratings enter, before they are stored."""
+    return min(max(quality, 0), 5)
+
+
 def fsrs_update_schedule(existing_word: Word, quality: int, review_moment: Optional[datetime] = None) -> None:
     """Update the scheduling fields for a word using a simplified FSRS/SM-2 style algorithm.
 
-    Quality: 0-5 scale. Values < 3 are treated as a lapse; values >= 3 are treated as success.
+    Quality: 0-5 scale (see clamp_quality). Values < 3 are treated as a lapse;
+    values >= 3 are treated as success.
     """
     if review_moment is None:
-        review_moment = current_time()
-
-    # Normalize timestamps to naive UTC for SQLite
-    review_moment = to_naive_utc(review_moment)
+        review_moment = _utcnow()
+    else:
+        # Normalize caller-supplied timestamps to naive UTC for SQLite
+        review_moment = to_naive_utc(review_moment)
 
     minimum_ease = 1.3
     ease_factor = existing_word.ease_factor or 2.5
@@ -142,15 +268,12 @@ def fsrs_update_schedule(existing_word: Word, quality: int, review_moment: Optio
         interval_days = 1
         ease_factor = max(minimum_ease, ease_factor - 0.2)
     else:
-        if repetitions == 0:
-            interval_days = 1
-        elif repetitions == 1:
-            interval_days = 6
+        if repetitions in INITIAL_INTERVAL:
+            interval_days = INITIAL_INTERVAL[repetitions]
         else:
             interval_days = int(round(interval_days * ease_factor))
 
-        ease_delta = 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)
-        ease_factor = max(minimum_ease, ease_factor + ease_delta)
+        ease_factor = max(minimum_ease, ease_factor + EASE_DELTA[quality])
         repetitions = repetitions + 1
 
     next_review = review_moment + timedelta(days=interval_days)
@@ -165,26 +288,122 @@ def fsrs_update_schedule(existing_word: Word, quality: int, review_moment: Optio
         existing_word.times_correct = (existing_word.times_correct or 0) + 1
 
 
+def fsrs_update_bulk(
+    ease_factors: Iterable[float],
+    intervals: Iterable[int],
+    repetitions: Iterable[int],
+    qualities: Iterable[int],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Vectorized counterpart of fsrs_update_schedule for many cards at once.
+
+    Qualities must already be on the 0-5 scale. Returns the new
+    ``(ease_factors, intervals, repetitions)`` arrays.
+    """
+    minimum_ease = 1.3
+    ef = np.asarray(ease_factors, dtype=float)
+    interval_days = np.asarray(intervals, dtype=np.int64)
+    reps = np.asarray(repetitions, dtype=np.int64)
+    q = np.asarray(qualities, dtype=np.int64)
+    lapse = q < 3
+
+    # np.rint rounds half to even, like round() in the scalar version
+    grown = np.rint(interval_days * ef).astype(np.int64)
+    success_interval = np.select(
+        [reps == r for r in INITIAL_INTERVAL], list(INITIAL_INTERVAL.values()), default=grown
+    )
+    new_intervals = np.where(lapse, 1, success_interval)
+
+    new_ease = np.maximum(minimum_ease, np.where(lapse, ef - 0.2, ef + EASE_DELTA_ARRAY[q]))
+    new_reps = np.where(lapse, 0, reps + 1)
+
+    return new_ease, new_intervals, new_reps
+
+
+def bulk_grade(db_session, pairs: Iterable[Tuple[int, int]], review_moment: Optional[datetime] = None) -> int:
+    """Grade many words at once and record a StudySession for each.
+
+    ``pairs`` are ``(word_id, quality)``; each word should appear at most once and
+    unknown ids are ignored. Qualities are clamped to 0-5 before they are scheduled
+    and stored. Returns the number of words graded.
+    """
+    if review_moment is None:
+        review_moment = _utcnow()
+    else:
+        review_moment = to_naive_utc(review_moment)
+
+    qualities = {word_id: clamp_quality(quality) for word_id, quality in pairs}
+    word_ids = list(qualities)
+    rows = []
+    for start in range(0, len(word_ids), SQLITE_BATCH_SIZE):
+        chunk = word_ids[start:start + SQLITE_BATCH_SIZE]
+        rows.extend(db_session.execute(
+            select(Word.id, Word.ease_factor, Word.interval, Word.repetitions, Word.times_studied, Word.times_correct)
+            .where(Word.id.in_(chunk))
+        ).all())
+    if not rows:
+        return 0
+
+    row_qualities = [qualities[r.id] for r in rows]
+    ease_factors, intervals, repetitions = fsrs_update_bulk(
+        [r.ease_factor or 2.5 for r in rows],
+        [r.interval or 0 for r in rows],
+        [r.repetitions or 0 for r in rows],
+        row_qualities,
+    )
+
+    updates = []
+    sessions = []
+    for r, quality, ef, interval_days, reps in zip(rows, row_qualities, ease_factors, intervals, repetitions):
+        next_review = review_moment + timedelta(days=int(interval_days))
+        updates.append({
+            "id": r.id,
+            "ease_factor": float(ef),
+            "interval": int(interval_days),
+            "repetitions": int(reps),
+            "last_studied": review_moment,
+            "next_review": next_review,
+            "times_studied": (r.times_studied or 0) + 1,
+            "times_correct": (r.times_correct or 0) + (1 if quality >= 3 else 0),
+        })
+        sessions.append({
+            "word_id": r.id,
+            "quality": quality,
+            "review_date": review_moment,
+            "next_review": next_review,
+            "ease_factor": float(ef),
+            "interval": int(interval_days),
+        })
+
+    db_session.bulk_update_mappings(Word, updates)
+    db_session.bulk_insert_mappings(StudySession, sessions)
+    db_session.commit()
+    return len(rows)
+
+
 def get_due_or_new_word(db_session) -> Optional[Word]:
     plan = get_active_study_plan(db_session)
 
-    now = to_naive_utc(current_time())
+    now = _utcnow()
 
+    # Unscheduled words come before already-due ones. Two single-range queries
+    # each stay a plain ix_word_due seek; an OR of both ranges needs a sort.
     due_word = (
         db_session.query(Word)
-        .filter((Word.next_review == None) | (Word.next_review <= now))
-        .order_by(
-            # Prioritize those with a scheduled next_review that is already due
-            func.coalesce(Word.next_review, datetime(1970, 1, 1)),
-            Word.repetitions.asc(),
-            Word.date_added.asc(),
-        )
+        .filter(Word.next_review == None)
+        .order_by(Word.repetitions.asc(), Word.date_added.asc())
         .first()
     )
+    if due_word is None:
+        due_word = (
+            db_session.query(Word)
+            .filter(Word.next_review <= now)
+            .order_by(Word.next_review.asc(), Word.repetitions.asc(), Word.date_added.asc())
+            .first()
+        )
     if due_word is not None:
         return due_word
 
-    today_begin = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    today_begin = _utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
     studied_today = (
         db_session.query(StudySession)
         .filter(StudySession.review_date >= today_begin)
@@ -204,41 +423,164 @@ def get_due_or_new_word(db_session) -> Optional[Word]:
 
 
 def calculate_summary_stats(db_session) -> Dict[str, Any]:
-    total_words = db_session.query(Word).count()
-
-    now = to_naive_utc(current_time())
-    due_count = (
-        db_session.query(Word)
-        .filter((Word.next_review == None) | (Word.next_review <= now))
-        .count()
-    )
-
-    today_begin = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-    sessions_today = (
-        db_session.query(StudySession).filter(StudySession.review_date >= today_begin).all()
-    )
-
-    studied_today = len(sessions_today)
-    if studied_today > 0:
-        avg_quality = sum(s.quality for s in sessions_today) / studied_today
-    else:
-        avg_quality = 0.0
-
-    correct_total = db_session.query(func.coalesce(func.sum(Word.times_correct), 0)).scalar() or 0
-    studied_total = db_session.query(func.coalesce(func.sum(Word.times_studied), 0)).scalar() or 0
-    accuracy = (correct_total / studied_total) * 100.0 if studied_total else 0.0
+    now = _utcnow()
+    today_begin = _utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    # Two one-row aggregates cross-joined: one pass over word, one over today's sessions
+    word_totals = select(
+        func.count().label("total_words"),
+        func.coalesce(func.sum(case((Word.next_review.is_(None) | (Word.next_review <= now), 1), else_=0)), 0).label("due_count"),
+        func.coalesce(func.sum(Word.times_correct), 0).label("correct_total"),
+        func.coalesce(func.sum(Word.times_studied), 0).label("studied_total"),
+    ).subquery()
+    session_totals = select(
+        func.count().label("studied_today"),
+        func.avg(StudySession.quality).label("avg_quality"),
+    ).where(StudySession.review_date >= today_begin).subquery()
+    row = db_session.execute(
+        select(word_totals, session_totals).join_from(word_totals, session_totals, true())
+    ).one()
+
+    avg_quality = row.avg_quality or 0.0
+    accuracy = (row.correct_total / row.studied_total) * 100.0 if row.studied_total else 0.0
 
     return {
-        "total_words": total_words,
-        "due_count": due_count,
-        "studied_today": studied_today,
+        "total_words": row.total_words,
+        "due_count": row.due_count,
+        "studied_today": row.studied_today,
         "avg_quality_today": round(avg_quality, 2),
         "accuracy": round(accuracy, 2),
     }
 
 
+def prepare_import_records(rows: Iterable[Dict[str, Optional[str]]]) -> Tuple[List[Dict[str, str]], int]:
+    """Normalize CSV rows (keyed by lowercased header) into import records.
+
+    Returns the records with a usable ``word`` and the number of skipped rows.
+    """
+    records = []
+    skipped_count = 0
+    for row in rows:
+        record = {col: (row.get(col) or "").strip() for col in IMPORT_COLUMNS}
+        if record["word"]:
+            records.append(record)
+        else:
+            skipped_count += 1
+    return records, skipped_count
+
+
+def upsert_words(db_session, records: List[Dict[str, str]]) -> Tuple[int, int]:
+    """Insert or update words in bulk using INSERT ... ON CONFLICT.
+
+    Missing meanings are resolved from the dictionary in one batched lookup.
+    Returns ``(imported, updated)`` counts; committing is left to the caller.
+    """
+    entries = lookup_dictionary_entries(r["word"] for r in records if not r["meaning"])
+
+    rows = []
+    for r in records:
+        meaning = r["meaning"]
+        if not meaning:
+            entry = entries.get(nocase_key(r["word"]))
+            meaning = (entry or {}).get("definition") or ""
+        rows.append({
+            "word": r["word"],
+            "meaning": meaning,
+            "example_sentence": r["example_sentence"] or None,
+            "part_of_speech": r["part_of_speech"] or None,
+            "difficulty_level": r["difficulty_level"] or "medium",
+        })
+
+    unique_words = list(dict.fromkeys(row["word"] for row in rows))
+    seen = set()
+    for start in range(0, len(unique_words), SQLITE_BATCH_SIZE):
+        chunk = unique_words[start:start + SQLITE_BATCH_SIZE]
+        seen.update(db_session.execute(select(Word.word).where(Word.word.in_(chunk))).scalars())
+
+    imported_count = 0
+    updated_count = 0
+    for row in rows:
+        if row["word"] in seen:
+            updated_count += 1
+        else:
+            seen.add(row["word"])
+            imported_count += 1
+
+    # Each row also binds the Python-side column defaults, so size batches by the
+    # full column count rather than by the keys in ``rows``
+    batch_size = SQLITE_MAX_VARIABLES // len(Word.__table__.columns)
+    for start in range(0, len(rows), batch_size):
+        stmt = sqlite_insert(Word).values(rows[start:start + batch_size])
+        excluded = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Word.word],
+            set_={
+                # Empty incoming values keep whatever is already stored
+                "meaning": func.coalesce(func.nullif(excluded.meaning, ""), Word.meaning),
+                "example_sentence": func.coalesce(excluded.example_sentence, Word.example_sentence),
+                "part_of_speech": func.coalesce(excluded.part_of_speech, Word.part_of_speech),
+                "difficulty_level": excluded.difficulty_level,
+            },
+        )
+        db_session.execute(stmt)
+
+    return imported_count, updated_count
+
+
+WORD_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS word_fts USING fts5(word, meaning, content='word', content_rowid='id')",
+    """CREATE TRIGGER IF NOT EXISTS word_fts_ai AFTER INSERT ON word BEGIN
+        INSERT INTO word_fts(rowid, word, meaning) VALUES (new.id, new.word, new.meaning);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS word_fts_ad AFTER DELETE ON word BEGIN
+        INSERT INTO word_fts(word_fts, rowid, word, meaning) VALUES ('delete', old.id, old.word, old.meaning);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS word_fts_au AFTER UPDATE OF word, meaning ON word BEGIN
+        INSERT INTO word_fts(word_fts, rowid, word, meaning) VALUES ('delete', old.id, old.word, old.meaning);
+        INSERT INTO word_fts(rowid, word, meaning) VALUES (new.id, new.word, new.meaning);
+    END""",
+]
+
+
+def create_word_search_index(db_session) -> None:
+    """Create the FTS5 index mirroring ``word`` and backfill it on first creation (SQLite only)."""
+    exists = db_session.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'word_fts'")
+    ).first()
+    for ddl in WORD_FTS_DDL:
+        db_session.execute(text(ddl))
+    if exists is None:
+        db_session.execute(text("INSERT INTO word_fts(word_fts) VALUES ('rebuild')"))
+    db_session.commit()
+
+
+def build_fts_query(query: str) -> str:
+    """Turn free-form search text into an FTS5 prefix query, one quoted term per token."""
+    terms = [t.replace('"', '""') for t in query.split()]
+    return " ".join(f'"{t}"*' for t in terms)
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cur = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cur.execute(pragma)
+    cur.close()
+
+
+def create_missing_indexes() -> None:
+    """create_all() skips existing tables, so add any indexes declared since they were created."""
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
+
+
 with app.app_context():
+    if db.engine.dialect.name == "sqlite":
+        event.listen(db.engine, "connect", apply_sqlite_pragmas)
     db.create_all()
+    create_missing_indexes()
+    if db.engine.dialect.name == "sqlite":
+        create_word_search_index(db.session)
     get_active_study_plan(db.session)
 
 
@@ -252,12 +594,38 @@ def index():
 @app.route("/words")
 def words_list():
     query = request.args.get("q", "").strip()
-    q = db.session.query(Word)
-    if query:
+    # Read-only view: plain rows with only the columns the template shows
+    stmt = select(
+        Word.id,
+        Word.word,
+        Word.meaning,
+        Word.part_of_speech,
+        Word.ease_factor,
+        Word.interval,
+        Word.repetitions,
+        Word.next_review,
+    )
+    if query and db.engine.dialect.name == "sqlite":
+        matches = (
+            text("SELECT rowid FROM word_fts WHERE word_fts MATCH :q")
+            .bindparams(q=build_fts_query(query))
+            .columns(rowid=db.Integer)
+        )
+        stmt = stmt.where(Word.id.in_(matches))
+    elif query:
         like = f"%{query}%"
-        q = q.filter((Word.word.ilike(like)) | (Word.meaning.ilike(like)))
-    words = q.order_by(Word.word.asc()).all()
-    return render_template("words.html", words=words, query=query)
+        stmt = stmt.where((Word.word.ilike(like)) | (Word.meaning.ilike(like)))
+
+    # Keyset pagination over the unique word column
+    after = request.args.get("after", "")
+    if after:
+        stmt = stmt.where(Word.word > after)
+    words = db.session.execute(stmt.order_by(Word.word.asc()).limit(WORDS_PAGE_SIZE + 1)).all()
+    next_after = None
+    if len(words) > WORDS_PAGE_SIZE:
+        words = words[:WORDS_PAGE_SIZE]
+        next_after = words[-1].word
+    return render_template("words.html", words=words, query=query, after=after, next_after=next_after)
 
 
 @app.route("/add", methods=["GET", "POST"])
@@ -325,6 +693,7 @@ def edit_word(word_id: int):
 def delete_word(word_id: int):
     w = db.session.get(Word, word_id)
     if w:
+        db.session.query(StudySession).filter_by(word_id=w.id).delete()
         db.session.delete(w)
         db.session.commit()
     return redirect(url_for("words_list"))
@@ -337,57 +706,38 @@ def import_csv():
         if not file:
             return render_template("import_csv.html", error="Please upload a CSV file", result=None)
 
-        try:
-            df = pd.read_csv(file)
-        except Exception:
-            return render_template("import_csv.html", error="Failed to read CSV. Ensure it's a valid CSV.", result=None)
-
-        normalized_cols = [c.strip().lower() for c in df.columns]
-        df.columns = normalized_cols
-
         imported_count = 0
         updated_count = 0
         skipped_count = 0
 
-        for _, row in df.iterrows():
-            word_str = str(row.get("word", "")).strip()
-            if not word_str or word_str.lower() == "nan":
-                skipped_count += 1
-                continue
-
-            meaning = row.get("meaning")
-            example = row.get("example_sentence")
-            part_of_speech = row.get("part_of_speech")
-            difficulty_level = row.get("difficulty_level", "medium") or "medium"
-
-            if (meaning is None or str(meaning).strip() == ""):
-                dict_entry = lookup_dictionary_entry(word_str)
-                if dict_entry and dict_entry.get("definition"):
-                    meaning = dict_entry.get("definition")
-                else:
-                    meaning = ""
-
-            existing = db.session.query(Word).filter_by(word=word_str).first()
-            if existing:
-                existing.meaning = str(meaning) if meaning is not None else existing.meaning
-                if example and str(example).strip():
-                    existing.example_sentence = str(example)
-                if part_of_speech and str(part_of_speech).strip():
-                    existing.part_of_speech = str(part_of_speech)
-                existing.difficulty_level = str(difficulty_level)
-                updated_count += 1
-            else:
-                new_word = Word(
-                    word=word_str,
-                    meaning=str(meaning) if meaning is not None else "",
-                    example_sentence=str(example) if example and str(example).strip() else None,
-                    part_of_speech=str(part_of_speech) if part_of_speech and str(part_of_speech).strip() else None,
-                    difficulty_level=str(difficulty_level),
-                )
-                db.session.add(new_word)
-                imported_count += 1
+        read_error = "Failed to read CSV. Ensure it's a valid CSV."
+        try:
+            stream = io.TextIOWrapper(file.stream, encoding="utf-8-sig", newline="")
+            reader = csv.DictReader(stream)
+            if reader.fieldnames is None:
+                raise ValueError("CSV has no header row")
+            reader.fieldnames = [c.strip().lower() for c in reader.fieldnames]
+        except (csv.Error, UnicodeDecodeError, ValueError):
+            return render_template("import_csv.html", error=read_error, result=None)
 
-        db.session.commit()
+        try:
+            while True:
+                try:
+                    chunk = list(itertools.islice(reader, IMPORT_CHUNK_SIZE))
+                except (csv.Error, UnicodeDecodeError):
+                    db.session.rollback()
+                    return render_template("import_csv.html", error=read_error, result=None)
+                if not chunk:
+                    break
+                records, skipped = prepare_import_records(chunk)
+                imported, updated = upsert_words(db.session, records)
+                imported_count += imported
+                updated_count += updated
+                skipped_count += skipped
+            db.session.commit()
+        except SQLAlchemyError:
+            db.session.rollback()
+            return render_template("import_csv.html", error="Failed to save the imported words. Please try again.", result=None)
 
         result = {
             "imported": imported_count,
@@ -402,29 +752,39 @@ def import_csv():
 
 @app.route("/export/csv")
 def export_csv():
-    words = db.session.query(Word).order_by(Word.word.asc()).all()
-    rows = []
-    for w in words:
-        rows.append({
-            "word": w.word,
-            "meaning": w.meaning,
-            "example_sentence": w.example_sentence or "",
-            "part_of_speech": w.part_of_speech or "",
-            "difficulty_level": w.difficulty_level or "",
-            "date_added": w.date_added.isoformat() if w.date_added else "",
-            "times_studied": w.times_studied or 0,
-            "times_correct": w.times_correct or 0,
-            "last_studied": w.last_studied.isoformat() if w.last_studied else "",
-            "next_review": w.next_review.isoformat() if w.next_review else "",
-            "ease_factor": w.ease_factor or 2.5,
-            "interval": w.interval or 0,
-            "repetitions": w.repetitions or 0,
-        })
+    def generate():
+        buf = io.StringIO()
+        writer = csv.writer(buf, lineterminator="\n")
+        writer.writerow(EXPORT_CSV_COLUMNS)
+        stmt = (
+            select(*(Word.__table__.c[col] for col in EXPORT_CSV_COLUMNS))
+            .order_by(Word.word.asc())
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        for w in db.session.execute(stmt):
+            writer.writerow([
+                w.word,
+                w.meaning,
+                w.example_sentence or "",
+                w.part_of_speech or "",
+                w.difficulty_level or "",
+                w.date_added.isoformat() if w.date_added else "",
+                w.times_studied or 0,
+                w.times_correct or 0,
+                w.last_studied.isoformat() if w.last_studied else "",
+                w.next_review.isoformat() if w.next_review else "",
+                w.ease_factor or 2.5,
+                w.interval or 0,
+                w.repetitions or 0,
+            ])
+            if buf.tell() >= 65536:
+                yield buf.getvalue().encode("utf-8")
+                buf.seek(0)
+                buf.truncate()
+        yield buf.getvalue().encode("utf-8")
 
-    df = pd.DataFrame(rows)
-    csv_bytes = df.to_csv(index=False).encode("utf-8")
     return Response(
-        csv_bytes,
+        stream_with_context(generate()),
         mimetype="text/csv",
         headers={
             "Content-Disposition": "attachment; filename=words_export.csv"
@@ -434,22 +794,27 @@ def export_csv():
 
 @app.route("/export/anki")
 def export_anki():
-    words = db.session.query(Word).order_by(Word.word.asc()).all()
-    lines = []
-    for w in words:
-        back_parts: List[str] = []
-        if w.meaning:
-            back_parts.append(w.meaning)
-        if w.part_of_speech:
-            back_parts.append(f"({w.part_of_speech})")
-        if w.example_sentence:
-            back_parts.append(f"Example: {w.example_sentence}")
-        back_text = " — ".join([p for p in back_parts if p])
-        lines.append(f"{w.word}\t{back_text}")
-
-    content = "\n".join(lines).encode("utf-8")
+    def generate():
+        separator = ""
+        stmt = (
+            select(Word.word, Word.meaning, Word.part_of_speech, Word.example_sentence)
+            .order_by(Word.word.asc())
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        for w in db.session.execute(stmt):
+            back_parts: List[str] = []
+            if w.meaning:
+                back_parts.append(w.meaning)
+            if w.part_of_speech:
+                back_parts.append(f"({w.part_of_speech})")
+            if w.example_sentence:
+                back_parts.append(f"Example: {w.example_sentence}")
+            back_text = " — ".join(back_parts)
+            yield f"{separator}{w.word}\t{back_text}".encode("utf-8")
+            separator = "\n"
+
     return Response(
-        content,
+        stream_with_context(generate()),
         mimetype="text/tab-separated-values",
         headers={
             "Content-Disposition": "attachment; filename=anki_export.txt"
@@ -478,7 +843,7 @@ def study_rate():
         return redirect(url_for("study"))
 
     try:
-        quality = int(quality_str)
+        quality = clamp_quality(int(quality_str))
     except ValueError:
         quality = 0
 
@@ -486,7 +851,7 @@ def study_rate():
     session = StudySession(
         word_id=w.id,
         quality=quality,
-        review_date=to_naive_utc(current_time()),
+        review_date=_utcnow(),
         next_review=w.next_review,
         ease_factor=w.ease_factor,
         interval=w.interval,
@@ -497,6 +862,47 @@ def study_rate():
     return redirect(url_for("study"))
 
 
+@app.route("/reschedule_all", methods=["POST"])
+def reschedule_all():
+    """Reschedule every overdue scheduled word as if rated with one quality, in one bulk update.
+
+    Only the scheduling columns change: nothing was reviewed, so no StudySession is
+    recorded and the study counters stay as they are.
+    """
+    try:
+        quality = clamp_quality(int(request.form.get("quality", "")))
+    except ValueError:
+        return redirect(url_for("study_plan"))
+
+    now = _utcnow()
+    rows = db.session.execute(
+        select(Word.id, Word.ease_factor, Word.interval, Word.repetitions).where(Word.next_review <= now)
+    ).all()
+    if rows:
+        ease_factors, intervals, repetitions = fsrs_update_bulk(
+            [r.ease_factor or 2.5 for r in rows],
+            [r.interval or 0 for r in rows],
+            [r.repetitions or 0 for r in rows],
+            [quality] * len(rows),
+        )
+        db.session.execute(
+            update(Word),
+            [
+                {
+                    "id": r.id,
+                    "ease_factor": float(ef),
+                    "interval": int(interval_days),
+                    "repetitions": int(reps),
+                    "next_review": now + timedelta(days=int(interval_days)),
+                }
+                for r, ef, interval_days, reps in zip(rows, ease_factors, intervals, repetitions)
+            ],
+        )
+        db.session.commit()
+
+    return redirect(url_for("study"))
+
+
 @app.route("/study_plan", methods=["GET", "POST"])
 def study_plan():
     plan = get_active_study_plan(db.session)
@@ -508,8 +914,11 @@ def study_plan():
         except ValueError:
             words_per_day = plan.words_per_day
 
-        plan.words_per_day = words_per_day
-        db.session.commit()
+        stored = db.session.get(StudyPlan, plan.id)
+        if stored is not None:
+            stored.words_per_day = words_per_day
+            db.session.commit()
+        _PLAN_CACHE["plan"] = None
         return redirect(url_for("study"))
 
     return render_template("study_plan.html", plan=plan)
@@ -520,14 +929,13 @@ def progress():
     stats = calculate_summary_stats(db.session)
 
     # Aggregate recent sessions for a simple activity display
-    last_30_days = datetime.utcnow() - timedelta(days=30)
-    sessions = (
-        db.session.query(StudySession)
-        .filter(StudySession.review_date >= last_30_days)
+    last_30_days = _utcnow() - timedelta(days=30)
+    sessions = db.session.execute(
+        select(StudySession.review_date, StudySession.quality, StudySession.interval)
+        .where(StudySession.review_date >= last_30_days)
         .order_by(StudySession.review_date.desc())
         .limit(100)
-        .all()
-    )
+    ).all()
 
     return render_template("progress.html", stats=stats, sessions=sessions)
 
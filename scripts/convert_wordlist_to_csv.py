@@ -1,6 +1,24 @@
 #!/usr/bin/env python3
 import sys
-import csv
+
+CHUNK_SIZE = 1 << 20
+
+
+def write_words(fout, lines):
+    words = []
+    for line in lines:
+        word = line.strip()
+        if not word.isascii():
+            # bytes.strip() only knows ASCII whitespace; NBSP and friends need str.strip()
+            word = word.decode("utf-8").strip().encode("utf-8")
+        if not word:
+            continue
+        # Single-column CSV: only fields containing a comma or quote need quoting
+        if b',' in word or b'"' in word:
+            word = b'"' + word.replace(b'"', b'""') + b'"'
+        words.append(word)
+    if words:
+        fout.write(b"\n".join(words) + b"\n")
 
 
 def main():
@@ -11,14 +29,22 @@ def main():
     input_path = sys.argv[1]
     output_path = sys.argv[2]
 
-    with open(input_path, "r", encoding="utf-8") as fin, open(output_path, "w", newline="", encoding="utf-8") as fout:
-        writer = csv.writer(fout)
-        writer.writerow(["word"]) 
-        for line in fin:
-            word = line.strip()
-            if word:
-                writer.writerow([word])
+    with open(input_path, "rb") as fin, open(output_path, "wb") as fout:
+        if fin.peek(3)[:3] == b"\xef\xbb\xbf":
+            fin.read(3)
+        fout.write(b"word\n")
+        pending = b""
+        while True:
+            chunk = fin.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            lines = (pending + chunk).splitlines(keepends=True)
+            # Keep the trailing partial line for the next chunk; a line ending in CR
+            # also waits, in case its LF starts the next chunk
+            pending = lines.pop() if not lines[-1].endswith(b"\n") else b""
+            write_words(fout, lines)
+        write_words(fout, [pending])
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -5,13 +5,59 @@ import sqlite3
 from pathlib import Path
 
 
-def lookup_definition(conn, word):
-    cur = conn.cursor()
-    cur.execute("SELECT definition, pos FROM stardict WHERE word = ? COLLATE NOCASE LIMIT 1", (word,))
-    row = cur.fetchone()
-    if not row:
-        return None, None
-    return row[0], row[1]
+# Stay below SQLite's default limit of 999 bound parameters per statement
+LOOKUP_CHUNK_SIZE = 900
+# SQLite's NOCASE collation folds only ASCII letters; fold keys the same way
+NOCASE_FOLD = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')
+
+
+def lookup_definitions(conn, words):
+    """Return {ASCII-folded word: (definition, pos)} for all words found."""
+    words = list(words)
+    lookup = {}
+    for start in range(0, len(words), LOOKUP_CHUNK_SIZE):
+        chunk = words[start:start + LOOKUP_CHUNK_SIZE]
+        placeholders = ','.join('?' * len(chunk))
+        cur = conn.execute(
+            f"SELECT word, definition, pos FROM stardict WHERE word COLLATE NOCASE IN ({placeholders})",
+            chunk,
+        )
+        for word, definition, pos in cur:
+            # Keep the first row per key, as the old `= ? COLLATE NOCASE LIMIT 1` lookup did
+            lookup.setdefault(word.translate(NOCASE_FOLD), (definition, pos))
+    return lookup
+
+
+def has_nocase_index(conn):
+    """True if some index on stardict leads with `word` under NOCASE collation."""
+    for index in conn.execute("PRAGMA index_list(stardict)").fetchall():
+        key_columns = [c for c in conn.execute(f'PRAGMA index_xinfo("{index[1]}")').fetchall() if c[5]]
+        if key_columns and key_columns[0][2] == 'word' and key_columns[0][4].upper() == 'NOCASE':
+            return True
+    return False
+
+
+def ensure_nocase_index(dict_path):
+    """Make sure `word COLLATE NOCASE` lookups are an index seek rather than a scan.
+
+    Only opens a writable connection when the index is actually missing.
+    """
+    conn = sqlite3.connect(f"{dict_path.resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        if has_nocase_index(conn):
+            return
+    finally:
+        conn.close()
+
+    conn = sqlite3.connect(str(dict_path))
+    try:
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_stardict_word_nocase ON stardict(word COLLATE NOCASE)")
+        conn.commit()
+    except sqlite3.OperationalError as exc:
+        # A read-only dictionary still works, lookups just scan
+        print("Could not create NOCASE index on stardict:", exc)
+    finally:
+        conn.close()
 
 
 def main():
@@ -27,7 +73,9 @@ def main():
         print("Dictionary DB not found:", dict_path)
         sys.exit(2)
 
-    conn = sqlite3.connect(str(dict_path))
+    ensure_nocase_index(dict_path)
+    # Lookups only read, so skip write locking and implicit transactions
+    conn = sqlite3.connect(f"{dict_path.resolve().as_uri()}?mode=ro", uri=True, isolation_level=None)
 
     with open(input_path, newline='', encoding='utf-8') as fin:
         reader = csv.DictReader(fin)
@@ -41,16 +89,22 @@ def main():
             if col not in fieldnames:
                 fieldnames.append(col)
 
-        rows = []
-        for row in reader:
-            word = (row.get('word') or '').strip()
-            if word and not (row.get('meaning') or '').strip():
-                definition, pos = lookup_definition(conn, word)
-                if definition:
-                    row['meaning'] = definition
-                if pos:
-                    row['part_of_speech'] = pos
-            rows.append(row)
+        rows = list(reader)
+
+    # Stripped lookup keys for rows missing a meaning; the rows themselves are written unchanged
+    pending = []
+    for row in rows:
+        word = (row.get('word') or '').strip()
+        if word and not (row.get('meaning') or '').strip():
+            pending.append((row, word.translate(NOCASE_FOLD)))
+    lookup = lookup_definitions(conn, {key for _, key in pending})
+
+    for row, key in pending:
+        definition, pos = lookup.get(key, (None, None))
+        if definition:
+            row['meaning'] = definition
+        if pos:
+            row['part_of_speech'] = pos
 
     with open(output_path, 'w', newline='', encoding='utf-8') as fout:
         writer = csv.DictWriter(fout, fieldnames=fieldnames)